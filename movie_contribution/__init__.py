@@ -8,6 +8,10 @@ def create_app(test_config=None):
     app.config.from_mapping(
         SECRET_KEY='dev',
         DATABASE=os.path.join(app.instance_path, 'title_contribution.sqlite'),
+        MOVIE_CACHE_SIZE=256,
+        # Seconds a cached movie is trusted, this bounds how long
+        # changes made by other processes can go unseen
+        MOVIE_CACHE_TTL=5,
     )
 
     if test_config is not None:
@@ -23,8 +27,14 @@ def create_app(test_config=None):
     from movie_contribution.error import page_not_found_error
     app.register_error_handler(404, page_not_found_error)
 
-    from movie_contribution import database
+    from movie_contribution import database, maintenance
     database.init_app(app)
+    maintenance.init_app(app)
+
+    from movie_contribution.cache import LRUCache
+    app.extensions['movie_cache'] = LRUCache(
+        app.config['MOVIE_CACHE_SIZE'], app.config['MOVIE_CACHE_TTL']
+    )
 
     from movie_contribution import auth, movie
     app.register_blueprint(auth.bp)
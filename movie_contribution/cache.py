@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    A small thread safe cache which drops the
+    least recently used entry once it is full,
+    and any entry older than ttl seconds
+    """
+    def __init__(self, max_size, ttl):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # The generation is bumped by every invalidate, the last
+        # generation of each recently invalidated key is kept so a
+        # value read before an invalidate is never cached after it
+        self._generation = 0
+        self._invalidated = OrderedDict()
+        self._oldest_generation = 0
+
+    def generation(self):
+        """
+        Returns the current generation, take this before
+        reading a value to pass to set once it is read
+        """
+        with self._lock:
+            return self._generation
+
+    def get(self, key):
+        """
+        Returns the cached value for key,
+        or None if it is not cached
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+
+            value, expires = self._entries[key]
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, generation=None):
+        """
+        Caches value for key, unless key has been invalidated
+        since generation was taken, as the value may be stale
+        """
+        with self._lock:
+            if generation is not None and self._is_stale(key, generation):
+                return
+
+            self._entries[key] = (value, time.monotonic() + self._ttl)
+            self._entries.move_to_end(key)
+
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+            self._generation += 1
+            self._invalidated[key] = self._generation
+            self._invalidated.move_to_end(key)
+
+            # Once a key is forgotten we can't tell if it was invalidated,
+            # so treat anything read before its generation as stale
+            if len(self._invalidated) > self._max_size:
+                _, self._oldest_generation = self._invalidated.popitem(last=False)
+
+    def _is_stale(self, key, generation):
+        if generation < self._oldest_generation:
+            return True
+
+        return self._invalidated.get(key, 0) > generation
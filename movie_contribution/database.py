@@ -4,6 +4,9 @@ import click
 from flask import g, current_app
 from flask.cli import with_appcontext
 
+# The PRAGMA auto_vacuum value for INCREMENTAL
+AUTO_VACUUM_INCREMENTAL = 2
+
 def init_app(app):
     app.teardown_appcontext(close_db)
     app.cli.add_command(init_db_command)
@@ -32,6 +35,12 @@ def init_db():
     with current_app.open_resource('schema.sql') as schema_file:
         db.executescript(schema_file.read().decode('utf8'))
 
+    # The schema's auto_vacuum setting is ignored by a database file
+    # which already had tables, a one-off VACUUM makes it take effect
+    if db.execute('PRAGMA auto_vacuum').fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+        db.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        db.execute('VACUUM')
+
 def close_db(error=None):
     db = g.pop('db', None)
     if db is not None:
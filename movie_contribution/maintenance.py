@@ -0,0 +1,99 @@
+import click
+from flask.cli import with_appcontext
+
+from movie_contribution.database import AUTO_VACUUM_INCREMENTAL, get_db
+
+# Small batches keep each write transaction short so
+# requests waiting on the write lock are never stalled for long
+PURGE_BATCH_SIZE = 500
+VACUUM_BATCH_PAGES = 1000
+
+# How long a deleted movie can be restored before it is purged
+PURGE_AFTER_DAYS = 30
+
+def init_app(app):
+    app.cli.add_command(maintain_db_command)
+
+def purge_deleted_movies(db, older_than_days=PURGE_AFTER_DAYS, batch_size=PURGE_BATCH_SIZE):
+    """
+    Permanently removes movies which were deleted more than
+    older_than_days ago, committing after every batch.
+    Returns the number of movies purged.
+    """
+    purged = 0
+
+    while True:
+        cursor = db.execute(
+            "DELETE FROM movie WHERE movie_id IN ("
+            "SELECT movie_id FROM movie "
+            "WHERE deleted IS NOT NULL AND deleted <= datetime('now', ?) "
+            "LIMIT ?)",
+            (f"-{older_than_days} days", batch_size)
+        )
+        db.commit()
+
+        purged += cursor.rowcount
+        if cursor.rowcount < batch_size:
+            return purged
+
+def reclaim_free_pages(db, batch_pages=VACUUM_BATCH_PAGES):
+    """
+    Hands free pages back to the filesystem a batch at a time
+    using incremental_vacuum. Returns the number of bytes reclaimed.
+    """
+    page_size = db.execute("PRAGMA page_size").fetchone()[0]
+    start_pages = db.execute("PRAGMA page_count").fetchone()[0]
+    previous_pages = start_pages
+
+    while db.execute("PRAGMA freelist_count").fetchone()[0] > 0:
+        # incremental_vacuum only runs as its rows are stepped through
+        db.execute(f"PRAGMA incremental_vacuum({int(batch_pages)})").fetchall()
+        db.commit()
+
+        # Stop if a pass frees nothing, e.g. without auto_vacuum = INCREMENTAL
+        pages = db.execute("PRAGMA page_count").fetchone()[0]
+        if pages >= previous_pages:
+            break
+        previous_pages = pages
+
+    return (start_pages - previous_pages) * page_size
+
+def run_maintenance(db, older_than_days=PURGE_AFTER_DAYS):
+    """
+    Runs the routine database maintenance: purges old deleted
+    movies, reclaims the freed space, refreshes the query planner
+    statistics and checkpoints the write-ahead log if one is used.
+    Returns a summary of the work done.
+    """
+    purged = purge_deleted_movies(db, older_than_days)
+    can_reclaim = db.execute("PRAGMA auto_vacuum").fetchone()[0] == AUTO_VACUUM_INCREMENTAL
+    reclaimed_bytes = reclaim_free_pages(db) if can_reclaim else 0
+
+    db.execute("ANALYZE")
+    db.commit()
+
+    # PASSIVE never waits on readers or writers
+    db.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+
+    return {
+        "purged": purged,
+        "reclaimed_bytes": reclaimed_bytes,
+        "can_reclaim": can_reclaim,
+    }
+
+@click.command('maintain-db')
+@click.option('--older-than-days', default=PURGE_AFTER_DAYS, show_default=True,
+              help='Purge movies deleted more than this many days ago.')
+@with_appcontext
+def maintain_db_command(older_than_days):
+    summary = run_maintenance(get_db(), older_than_days)
+    if not summary['can_reclaim']:
+        click.echo(
+            "Warning: auto_vacuum is not INCREMENTAL so free space can't be "
+            "reclaimed, run PRAGMA auto_vacuum = INCREMENTAL then VACUUM to fix this",
+            err=True
+        )
+    click.echo(
+        f"Purged {summary['purged']} deleted movies, "
+        f"reclaimed {summary['reclaimed_bytes']} bytes"
+    )
@@ -1,7 +1,12 @@
+from datetime import datetime
+
 from flask import (
     Blueprint,
+    current_app,
     flash,
     g,
+    jsonify,
+    make_response,
     redirect,
     render_template,
     request,
@@ -17,6 +22,26 @@ bp = Blueprint("movie", __name__)
 ADD_TEMPLATE = "movie/add.html"
 UPDATE_TEMPLATE = "movie/update.html"
 
+# Movie request error messages
+TITLE_REQUIRED_ERROR = "Movie title is required"
+PLOT_REQUIRED_ERROR = "Movie plot is required"
+
+PAGE_SIZE = 20
+
+MINE_FIRST_PAGE_SQL = (
+    "SELECT movie_id, movie_title, plot, created "
+    "FROM movie WHERE added_by = ? AND deleted IS NULL "
+    "ORDER BY created DESC, movie_id LIMIT ?"
+)
+# The created <= ? bound lets SQLite seek straight to the page
+# in the index, rather than scanning the user's newer movies
+MINE_NEXT_PAGE_SQL = (
+    "SELECT movie_id, movie_title, plot, created "
+    "FROM movie WHERE added_by = ? AND deleted IS NULL "
+    "AND created <= ? AND (created < ? OR movie_id > ?) "
+    "ORDER BY created DESC, movie_id LIMIT ?"
+)
+
 @bp.route("/")
 @login_required
 def index():
@@ -29,10 +54,49 @@ def index():
     movies = db.execute(
         "SELECT movie_id, movie_title, plot, created, username "
         "FROM movie m JOIN user u ON m.added_by = u.user_id "
+        "WHERE m.deleted IS NULL "
         "ORDER BY created DESC"
     ).fetchall()
     return render_template("movie/index.html", movies=movies)
 
+@bp.route("/mine")
+@login_required
+def mine():
+    """
+    Lists the movies added by the logged in user,
+    a page at a time using the (created, movie_id)
+    of the last movie shown as the cursor
+    """
+    user_id = g.user["user_id"]
+    cursor = _parse_cursor(request.args.get("created"), request.args.get("movie_id"))
+
+    db = get_db()
+    if cursor is None:
+        movies = db.execute(MINE_FIRST_PAGE_SQL, (user_id, PAGE_SIZE + 1)).fetchall()
+    else:
+        created, movie_id = cursor
+        movies = db.execute(
+            MINE_NEXT_PAGE_SQL,
+            (user_id, created, created, movie_id, PAGE_SIZE + 1)
+        ).fetchall()
+
+    # We fetch one extra row to find out if there is another page
+    next_cursor = None
+    if len(movies) > PAGE_SIZE:
+        movies = movies[:PAGE_SIZE]
+        last_movie = movies[-1]
+        next_cursor = {
+            "created": str(last_movie["created"]),
+            "movie_id": last_movie["movie_id"],
+        }
+
+    return render_template(
+        "movie/mine.html",
+        movies=movies,
+        movie_count=g.user["movie_count"],
+        next_cursor=next_cursor,
+    )
+
 @bp.route("/add", methods=("GET", "POST"))
 @login_required
 def add():
@@ -73,6 +137,14 @@ def update(movie_id):
     """
     movie = _get_movie(movie_id)
 
+    # GET and HEAD, POST doesn't render the page
+    if request.method != "POST":
+        # The page also depends on who is viewing it, so it only
+        # has an ETag, a Last-Modified can't tell viewers apart
+        etag = f"{_movie_etag(movie)}-{g.user['user_id']}"
+        if _is_not_modified(etag):
+            return _not_modified(etag)
+
     if request.method == "POST":
         movie_title = request.form["movie_title"]
         plot = request.form["plot"]
@@ -85,14 +157,41 @@ def update(movie_id):
 
         db = get_db()
         db.execute(
-            "UPDATE movie SET movie_title = ?, plot = ?"
-            "WHERE movie_id = ?",
+            "UPDATE movie SET movie_title = ?, plot = ?, "
+            "updated = CURRENT_TIMESTAMP, version = version + 1 "
+            "WHERE movie_id = ? AND deleted IS NULL",
             (movie_title, plot, movie_id)
         )
         db.commit()
+        _movie_cache().invalidate(movie_id)
         return redirect(url_for("movie.index"))
 
-    return render_template("movie/update.html", movie=movie)
+    response = make_response(render_template("movie/update.html", movie=movie))
+    return _with_validators(response, etag)
+
+@bp.route("/<int:movie_id>/json")
+@login_required
+def movie_json(movie_id):
+    """
+    Returns a single movie as JSON, answering
+    conditional requests with a 304 when the
+    client's copy is still current
+    """
+    movie = _get_movie(movie_id)
+
+    etag = _movie_etag(movie)
+    if _is_not_modified(etag):
+        return _not_modified(etag, movie["updated"])
+
+    response = jsonify(
+        movie_id=movie["movie_id"],
+        movie_title=movie["movie_title"],
+        plot=movie["plot"],
+        created=movie["created"].isoformat(),
+        updated=movie["updated"].isoformat(),
+        username=movie["username"],
+    )
+    return _with_validators(response, etag, movie["updated"])
 
 @bp.route("/<int:movie_id>/delete", methods=("POST",))
 @login_required
@@ -100,6 +199,8 @@ def delete(movie_id):
     """
     Controller for deleting a movie from the database.
     Only admin users can perform this action.
+    The movie is only marked as deleted, it is purged
+    later by the maintenance job so it can be restored.
     """
     _get_movie(movie_id)
 
@@ -109,29 +210,135 @@ def delete(movie_id):
         abort(403)
 
     db = get_db()
-    db.execute("DELETE FROM movie WHERE movie_id = ?", (movie_id,))
+    db.execute(
+        "UPDATE movie SET deleted = CURRENT_TIMESTAMP "
+        "WHERE movie_id = ? AND deleted IS NULL",
+        (movie_id,)
+    )
     db.commit()
+    _movie_cache().invalidate(movie_id)
 
     return redirect(url_for("movie.index"))
 
+@bp.route("/deleted")
+@login_required
+def deleted():
+    """
+    Lists movies which have been deleted but not yet
+    purged, so an admin can restore them.
+    Only admin users can view this page.
+    """
+    if not g.user['is_admin']:
+        abort(403)
+
+    movies = get_db().execute(
+        "SELECT movie_id, movie_title, plot, created, deleted, username "
+        "FROM movie m JOIN user u ON m.added_by = u.user_id "
+        "WHERE m.deleted IS NOT NULL "
+        "ORDER BY deleted DESC"
+    ).fetchall()
+    return render_template("movie/deleted.html", movies=movies)
+
+@bp.route("/<int:movie_id>/restore", methods=("POST",))
+@login_required
+def restore(movie_id):
+    """
+    Controller for undoing the deletion of a movie.
+    Only admin users can perform this action.
+    """
+    if not g.user['is_admin']:
+        abort(403)
+
+    db = get_db()
+    restored = db.execute(
+        "UPDATE movie SET deleted = NULL "
+        "WHERE movie_id = ? AND deleted IS NOT NULL",
+        (movie_id,)
+    )
+    db.commit()
+    _movie_cache().invalidate(movie_id)
+
+    if restored.rowcount == 0:
+        abort(404, f"Deleted movie {movie_id} does not exist.")
+
+    return redirect(url_for("movie.deleted"))
+
+def validate_movie_requests(movies):
+    """
+    Validates many (movie_title, plot) pairs at once,
+    e.g. for a bulk import. Returns the validation error
+    for each movie in order, None if it is valid.
+    This must give the same result as _validate_movie_request
+    for every movie, which movie_test checks
+    """
+    return [
+        TITLE_REQUIRED_ERROR if movie_title is None
+        else PLOT_REQUIRED_ERROR if plot is None
+        else None
+        for movie_title, plot in movies
+    ]
+
 # Helpers
 
 def _get_movie(movie_id):
+    cache = _movie_cache()
+
+    # Taken before the read so an update racing with it isn't undone
+    generation = cache.generation()
+    movie = cache.get(movie_id)
+    if movie is not None:
+        return movie
+
     movie = get_db().execute(
-        "SELECT movie_id, movie_title, plot, created, username "
+        "SELECT movie_id, movie_title, plot, created, updated, version, username "
         "FROM movie m JOIN user u ON m.added_by = u.user_id "
-        "WHERE m.movie_id = ?",
+        "WHERE m.movie_id = ? AND m.deleted IS NULL",
         (movie_id,)
     ).fetchone()
 
     if movie is None:
-        abort(404, f"Movie {id} does not exist.")
+        abort(404, f"Movie {movie_id} does not exist.")
 
+    cache.set(movie_id, movie, generation)
     return movie
 
+def _movie_cache():
+    return current_app.extensions["movie_cache"]
+
+def _movie_etag(movie):
+    return f"{movie['movie_id']}-{movie['version']}"
+
+def _is_not_modified(etag):
+    # Only the ETag is trusted, Last-Modified is to the second
+    # so misses edits made within the same second
+    return request.if_none_match.contains_weak(etag)
+
+def _with_validators(response, etag, last_modified=None):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Pages are per user, so only the client may cache them,
+    # and it must check they are still current before reuse
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def _not_modified(etag, last_modified=None):
+    return _with_validators(make_response("", 304), etag, last_modified)
+
+def _parse_cursor(created, movie_id):
+    if created is None or movie_id is None:
+        return None
+
+    try:
+        # Normalised to the format SQLite stores timestamps in
+        return str(datetime.fromisoformat(created)), int(movie_id)
+    except ValueError:
+        abort(400, "Invalid page cursor.")
+
 def _validate_movie_request(movie_title, plot):
     if movie_title is None:
-        return "Movie title is required"
+        return TITLE_REQUIRED_ERROR
 
     if plot is None:
-        return "Movie plot is required"
+        return PLOT_REQUIRED_ERROR
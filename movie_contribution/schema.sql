@@ -1,3 +1,7 @@
+-- Let the maintenance job hand free pages back to the filesystem
+-- a few at a time, rather than needing a full VACUUM
+PRAGMA auto_vacuum = INCREMENTAL;
+
 DROP TABLE IF EXISTS user;
 DROP TABLE IF EXISTS movie;
 
@@ -6,7 +10,8 @@ CREATE TABLE user (
     username TEXT UNIQUE NOT NULL,
     email TEXT UNIQUE NOT NULL,
     is_admin BOOLEAN NOT NULL,
-    password TEXT NOT NULL
+    password TEXT NOT NULL,
+    movie_count INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE TABLE movie (
@@ -14,6 +19,44 @@ CREATE TABLE movie (
     movie_title TEXT NOT NULL,
     plot TEXT NOT NULL,
     created TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- Bumped on every edit, used to build the ETag for a movie
+    version INTEGER NOT NULL DEFAULT 1,
     added_by INTEGER NOT NULL,
+    deleted TIMESTAMP,
     FOREIGN KEY (added_by) REFERENCES user(user_id)
 );
+
+-- Serves the per-user listing, newest first, with movie_id as a tiebreaker
+CREATE INDEX movie_added_by_created ON movie (added_by, created DESC, movie_id)
+    WHERE deleted IS NULL;
+
+-- Lets the maintenance job find tombstones without scanning live movies
+CREATE INDEX movie_deleted ON movie (deleted) WHERE deleted IS NOT NULL;
+
+-- Keep user.movie_count in step with the live movies so the
+-- per-user listing never has to COUNT(*) over a user's movies
+CREATE TRIGGER movie_count_insert AFTER INSERT ON movie
+WHEN NEW.deleted IS NULL
+BEGIN
+    UPDATE user SET movie_count = movie_count + 1 WHERE user_id = NEW.added_by;
+END;
+
+CREATE TRIGGER movie_count_soft_delete AFTER UPDATE OF deleted ON movie
+WHEN OLD.deleted IS NULL AND NEW.deleted IS NOT NULL
+BEGIN
+    UPDATE user SET movie_count = movie_count - 1 WHERE user_id = OLD.added_by;
+END;
+
+CREATE TRIGGER movie_count_restore AFTER UPDATE OF deleted ON movie
+WHEN OLD.deleted IS NOT NULL AND NEW.deleted IS NULL
+BEGIN
+    UPDATE user SET movie_count = movie_count + 1 WHERE user_id = OLD.added_by;
+END;
+
+-- Purged tombstones were already taken off the count when soft deleted
+CREATE TRIGGER movie_count_delete AFTER DELETE ON movie
+WHEN OLD.deleted IS NULL
+BEGIN
+    UPDATE user SET movie_count = movie_count - 1 WHERE user_id = OLD.added_by;
+END;
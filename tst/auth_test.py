@@ -3,6 +3,7 @@ from flask import g, session
 
 from movie_contribution.database import get_db
 from movie_contribution.auth import (
+    validate_registrations,
     _validate_registration,
     _validate_username,
     _validate_email,
@@ -182,3 +183,17 @@ def test_validate_password_invalid_password():
 def test_validate_password_valid_password():
     validation_error = _validate_password("12345678")
     assert validation_error is None
+
+
+def test_validate_registrations_matches_single_validation():
+    registrations = [
+        (None, "test@imdb.com", "12345678"),
+        ("ABC", None, "12345678"),
+        ("ABC", "invalid email", "12345678"),
+        ("ABC", "test@imdb.com", None),
+        ("ABC", "test@imdb.com", "1"),
+        ("ABC", "test@imdb.com", "12345678"),
+    ]
+
+    expected_errors = [_validate_registration(*registration) for registration in registrations]
+    assert validate_registrations(registrations) == expected_errors
@@ -0,0 +1,74 @@
+import pytest
+
+from movie_contribution.cache import LRUCache
+
+def test_get_missing_key():
+    cache = LRUCache(2, 60)
+    assert cache.get("missing") is None
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2, 60)
+    cache.set(1, "one")
+    cache.set(2, "two")
+
+    # Using 1 makes 2 the least recently used
+    cache.get(1)
+    cache.set(3, "three")
+
+    assert cache.get(1) == "one"
+    assert cache.get(2) is None
+    assert cache.get(3) == "three"
+
+def test_invalidate():
+    cache = LRUCache(2, 60)
+    cache.set(1, "one")
+
+    cache.invalidate(1)
+    cache.invalidate("missing")
+
+    assert cache.get(1) is None
+
+def test_expires_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("movie_contribution.cache.time.monotonic", lambda: now[0])
+
+    cache = LRUCache(2, 5)
+    cache.set(1, "one")
+
+    now[0] += 4
+    assert cache.get(1) == "one"
+
+    now[0] += 1
+    assert cache.get(1) is None
+
+def test_set_after_invalidate_is_skipped():
+    cache = LRUCache(2, 60)
+
+    # A reader misses and reads the old value...
+    generation = cache.generation()
+    # ...an update commits and invalidates...
+    cache.invalidate(1)
+    # ...then the reader tries to cache what it read
+    cache.set(1, "stale", generation)
+
+    assert cache.get(1) is None
+
+    # A read started after the invalidate is cached as normal
+    cache.set(1, "fresh", cache.generation())
+    assert cache.get(1) == "fresh"
+
+def test_set_is_skipped_once_invalidation_is_forgotten():
+    cache = LRUCache(2, 60)
+
+    generation = cache.generation()
+    cache.invalidate(1)
+    # Push key 1 out of the invalidation history
+    cache.invalidate(2)
+    cache.invalidate(3)
+
+    cache.set(1, "stale", generation)
+    assert cache.get(1) is None
+
+    # Other keys read before the invalidations are treated as stale too
+    cache.set(4, "maybe stale", generation)
+    assert cache.get(4) is None
@@ -0,0 +1,115 @@
+"""
+Microbenchmarks for the hot helper functions.
+
+These aren't collected with the unit tests, run them with:
+    python -m pytest tst/hot_path_benchmark.py
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from movie_contribution.auth import (
+    validate_registrations,
+    _is_admin,
+    _validate_registration
+)
+from movie_contribution.database import get_db
+from movie_contribution.movie import (
+    validate_movie_requests,
+    _get_movie,
+    _validate_movie_request
+)
+
+# Sized like a large import, bulk benchmarks only run a few rounds
+BULK_ROWS = 1_000_000
+BULK_ROUNDS = 3
+
+# Movies in the synthetic database for the lookup benchmarks
+LARGE_DB_MOVIES = 200_000
+
+def _registrations(count):
+    return [
+        (f"user{i}", f"user{i}@example.com", "a-long-password")
+        for i in range(count)
+    ]
+
+def _movies(count):
+    return [(f"Movie {i}", "A plot") for i in range(count)]
+
+@pytest.fixture
+def large_app(app):
+    """The test app with a large synthetic movie table."""
+    with app.app_context():
+        db = get_db()
+        db.executemany(
+            "INSERT INTO movie (movie_title, plot, added_by) VALUES (?, ?, ?)",
+            ((f"Movie {i}", "A plot", i % 2 + 1) for i in range(LARGE_DB_MOVIES))
+        )
+        db.commit()
+
+    return app
+
+
+def test_validate_registration(benchmark):
+    error = benchmark(_validate_registration, "user", "user@example.com", "a-long-password")
+    assert error is None
+
+def test_is_admin(benchmark):
+    assert benchmark(_is_admin, "user@imdb.com")
+
+def test_validate_movie_request(benchmark):
+    error = benchmark(_validate_movie_request, "A Test Title", "A fake plot")
+    assert error is None
+
+def test_get_movie_large_db(benchmark, large_app):
+    with large_app.app_context():
+        movie = benchmark(_get_movie, LARGE_DB_MOVIES // 2)
+        assert movie["movie_id"] == LARGE_DB_MOVIES // 2
+
+def test_get_movie_large_db_uncached(benchmark, large_app):
+    movie_id = LARGE_DB_MOVIES // 2
+
+    with large_app.app_context():
+        cache = large_app.extensions["movie_cache"]
+        movie = benchmark.pedantic(
+            _get_movie,
+            args=(movie_id,),
+            setup=lambda: cache.invalidate(movie_id),
+            rounds=1000
+        )
+        assert movie["movie_id"] == movie_id
+
+
+@pytest.mark.benchmark(group="bulk registrations")
+def test_bulk_validate_registration_per_call(benchmark):
+    registrations = _registrations(BULK_ROWS)
+
+    errors = benchmark.pedantic(
+        lambda: [_validate_registration(*registration) for registration in registrations],
+        rounds=BULK_ROUNDS
+    )
+    assert not any(errors)
+
+@pytest.mark.benchmark(group="bulk registrations")
+def test_bulk_validate_registrations(benchmark):
+    registrations = _registrations(BULK_ROWS)
+
+    errors = benchmark.pedantic(validate_registrations, args=(registrations,), rounds=BULK_ROUNDS)
+    assert not any(errors)
+
+@pytest.mark.benchmark(group="bulk movies")
+def test_bulk_validate_movie_request_per_call(benchmark):
+    movies = _movies(BULK_ROWS)
+
+    errors = benchmark.pedantic(
+        lambda: [_validate_movie_request(*movie) for movie in movies],
+        rounds=BULK_ROUNDS
+    )
+    assert not any(errors)
+
+@pytest.mark.benchmark(group="bulk movies")
+def test_bulk_validate_movie_requests(benchmark):
+    movies = _movies(BULK_ROWS)
+
+    errors = benchmark.pedantic(validate_movie_requests, args=(movies,), rounds=BULK_ROUNDS)
+    assert not any(errors)
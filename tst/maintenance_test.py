@@ -0,0 +1,103 @@
+import sqlite3
+
+import pytest
+
+from movie_contribution.database import get_db, init_db
+from movie_contribution.maintenance import (
+    purge_deleted_movies,
+    reclaim_free_pages,
+    run_maintenance
+)
+
+def _add_deleted_movies(db, count, deleted):
+    db.executemany(
+        "INSERT INTO movie (movie_title, plot, added_by, deleted) VALUES (?, ?, ?, ?)",
+        [(f"Deleted Movie {i}", "x" * 2000, 1, deleted) for i in range(count)]
+    )
+    db.commit()
+
+def test_purge_deleted_movies_in_batches(app):
+    with app.app_context():
+        db = get_db()
+        _add_deleted_movies(db, 5, "2000-01-01 00:00:00")
+
+        purged = purge_deleted_movies(db, batch_size=2)
+        assert purged == 5
+
+        # Check only the live movie is left
+        count = db.execute("SELECT COUNT(*) FROM movie").fetchone()[0]
+        assert count == 1
+
+        # Check purging tombstones doesn't change the contribution count
+        movie_count = db.execute(
+            "SELECT movie_count FROM user WHERE user_id = 1"
+        ).fetchone()[0]
+        assert movie_count == 1
+
+def test_purge_deleted_movies_keeps_recent(app):
+    with app.app_context():
+        db = get_db()
+        db.execute("UPDATE movie SET deleted = CURRENT_TIMESTAMP WHERE movie_id = 1")
+        db.commit()
+
+        purged = purge_deleted_movies(db, older_than_days=30)
+        assert purged == 0
+
+        count = db.execute("SELECT COUNT(*) FROM movie").fetchone()[0]
+        assert count == 1
+
+def test_run_maintenance_reclaims_space(app):
+    with app.app_context():
+        db = get_db()
+        _add_deleted_movies(db, 200, "2000-01-01 00:00:00")
+
+        summary = run_maintenance(db)
+
+        assert summary["purged"] == 200
+        assert summary["reclaimed_bytes"] > 0
+        assert db.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+def test_maintain_db_command(app):
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["maintain-db"])
+
+    assert "Purged 0 deleted movies" in result.output
+
+def test_reclaim_free_pages_without_auto_vacuum(tmp_path):
+    db = sqlite3.connect(tmp_path / "no_auto_vacuum.sqlite")
+    db.execute("PRAGMA auto_vacuum = NONE")
+    db.execute("CREATE TABLE filler (data TEXT)")
+    db.executemany("INSERT INTO filler VALUES (?)", [("x" * 2000,)] * 200)
+    db.commit()
+    db.execute("DELETE FROM filler")
+    db.commit()
+
+    assert db.execute("PRAGMA freelist_count").fetchone()[0] > 0
+
+    # Check we give up rather than looping while the free pages are kept
+    assert reclaim_free_pages(db) == 0
+    db.close()
+
+def test_init_db_enables_incremental_vacuum_on_existing_file(app):
+    with app.app_context():
+        db = get_db()
+        db.execute("PRAGMA auto_vacuum = NONE")
+        db.execute("VACUUM")
+        assert db.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+
+        init_db()
+
+        assert db.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+def test_maintain_db_command_warns_without_auto_vacuum(app):
+    with app.app_context():
+        db = get_db()
+        db.execute("PRAGMA auto_vacuum = NONE")
+        db.execute("VACUUM")
+
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["maintain-db"])
+
+    assert "free space can't be reclaimed" in result.output
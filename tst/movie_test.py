@@ -2,7 +2,12 @@ import pytest
 from flask import g, session
 
 from movie_contribution.database import get_db
-from movie_contribution.movie import _get_movie, _validate_movie_request
+from movie_contribution.movie import (
+    MINE_NEXT_PAGE_SQL,
+    validate_movie_requests,
+    _get_movie,
+    _validate_movie_request
+)
 
 def test_index_suceeds(client, auth):
     response = client.get("/")
@@ -18,6 +23,75 @@ def test_index_suceeds(client, auth):
     assert response.status_code == 200
 
 
+def test_mine_lists_only_own_movies(client, app, auth):
+    with app.app_context():
+        db = get_db()
+        db.execute(
+            "INSERT INTO movie (movie_title, plot, added_by) VALUES (?, ?, ?)",
+            ("Someone Else's Movie", "Not mine", 2)
+        )
+        db.commit()
+
+    auth.login()
+    response = client.get("/mine")
+
+    assert response.status_code == 200
+    assert b"A Test Movie" in response.data
+    assert b"Someone Else&#39;s Movie" not in response.data
+    assert b"1 movie added" in response.data
+
+
+def test_mine_paginates_with_cursor(client, app, auth, monkeypatch):
+    monkeypatch.setattr("movie_contribution.movie.PAGE_SIZE", 2)
+
+    with app.app_context():
+        db = get_db()
+        db.executemany(
+            "INSERT INTO movie (movie_title, plot, created, added_by) VALUES (?, ?, ?, ?)",
+            [
+                ("Newest Movie", "plot", "2030-01-03 00:00:00", 1),
+                ("Tied Movie One", "plot", "2030-01-02 00:00:00", 1),
+                ("Tied Movie Two", "plot", "2030-01-02 00:00:00", 1),
+            ]
+        )
+        db.commit()
+
+    auth.login()
+    response = client.get("/mine")
+    assert b"4 movies added" in response.data
+    assert b"Newest Movie" in response.data
+    assert b"Tied Movie One" in response.data
+    assert b"Tied Movie Two" not in response.data
+
+    response = client.get("/mine?created=2030-01-02+00:00:00&movie_id=3")
+    assert b"Tied Movie Two" in response.data
+    assert b"A Test Movie" in response.data
+    assert b"Tied Movie One" not in response.data
+    assert b"Next page" not in response.data
+
+
+def test_mine_next_page_seeks_index(app):
+    with app.app_context():
+        plan = get_db().execute(
+            f"EXPLAIN QUERY PLAN {MINE_NEXT_PAGE_SQL}",
+            (1, "2030-01-02 00:00:00", "2030-01-02 00:00:00", 3, 21)
+        ).fetchall()
+
+    # Check the cursor is used as a range on the index, so
+    # later pages cost the same as the first
+    details = " ".join(row["detail"] for row in plan)
+    assert "USING INDEX movie_added_by_created (added_by=? AND created<?)" in details
+
+
+def test_mine_invalid_cursor(client, auth):
+    auth.login()
+    response = client.get("/mine?created=2030-01-02&movie_id=abc")
+    assert response.status_code == 400
+
+    response = client.get("/mine?created=abc&movie_id=1")
+    assert response.status_code == 400
+
+
 def test_add_succeeds(client, app, auth):
     auth.login()
 
@@ -61,6 +135,114 @@ def test_update_succeeds(client, app, auth):
         assert movie["plot"] == "A new plot for A Test Movie" # Does change
 
 
+def test_update_page_sends_validators(client, auth):
+    auth.login()
+
+    response = client.get("/1/update")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1-1-1"'
+    # The page is per user, which a Last-Modified can't express
+    assert "Last-Modified" not in response.headers
+
+    # Check a conditional request for the same version isn't rendered again
+    response = client.get("/1/update", headers={"If-None-Match": '"1-1-1"'})
+
+    assert response.status_code == 304
+    assert response.data == b""
+
+    # Check HEAD requests get the same validators
+    response = client.head("/1/update")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1-1-1"'
+
+    response = client.head("/1/update", headers={"If-None-Match": '"1-1-1"'})
+
+    assert response.status_code == 304
+
+
+def test_update_page_ignores_if_modified_since(client, auth):
+    auth.login()
+
+    response = client.get("/1/update", headers={
+        "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"
+    })
+
+    assert response.status_code == 200
+
+
+def test_update_changes_etag(client, auth):
+    auth.login()
+
+    client.get("/1/update")
+    client.post("/1/update", data={
+        "movie_title": "A Test Movie",
+        "plot": "A new plot for A Test Movie"
+    })
+
+    response = client.get("/1/update", headers={"If-None-Match": '"1-1-1"'})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1-2-1"'
+    assert b"A new plot for A Test Movie" in response.data
+
+
+def test_movie_json(client, auth):
+    auth.login()
+
+    response = client.get("/1/json")
+
+    assert response.status_code == 200
+    assert response.json["movie_title"] == "A Test Movie"
+    assert response.json["username"] == "test"
+    assert response.headers["ETag"] == '"1-1"'
+    last_modified = response.headers["Last-Modified"]
+
+    response = client.get("/1/json", headers={"If-None-Match": '"1-1"'})
+    assert response.status_code == 304
+
+    # Check a date alone can't skip an edit made in the same second
+    response = client.get("/1/json", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 200
+
+    response = client.get("/2/json")
+    assert response.status_code == 404
+
+
+def test_get_movie_is_cached(app):
+    with app.app_context():
+        assert _get_movie(1)["plot"] == "A super cool test movie"
+
+        db = get_db()
+        db.execute("UPDATE movie SET plot = 'Changed behind the cache' WHERE movie_id = 1")
+        db.commit()
+
+        # Check the cached movie is returned without reading the DB
+        assert _get_movie(1)["plot"] == "A super cool test movie"
+
+
+def test_get_movie_does_not_cache_row_read_before_update(app, monkeypatch):
+    with app.app_context():
+        cache = app.extensions["movie_cache"]
+        cache_set = cache.set
+
+        def set_after_update(key, value, generation=None):
+            # Simulate an update committing between the read and the set
+            db = get_db()
+            db.execute("UPDATE movie SET plot = 'Newer plot' WHERE movie_id = 1")
+            db.commit()
+            cache.invalidate(key)
+            cache_set(key, value, generation)
+
+        monkeypatch.setattr(cache, "set", set_after_update)
+        assert _get_movie(1)["plot"] == "A super cool test movie"
+        monkeypatch.undo()
+
+        # Check the old row wasn't left in the cache
+        assert _get_movie(1)["plot"] == "Newer plot"
+
+
 def test_delete_error_not_admin(client, auth, app):
     auth.login()
 
@@ -84,10 +266,66 @@ def test_delete_succeeds(client, auth, app):
 
     assert expected_location == actual_location
 
-    # Check we deleted the data in the DB
+    # Check we marked the movie as deleted in the DB
     with app.app_context():
-        count = get_db().execute("SELECT COUNT(*) FROM movie").fetchone()[0]
-        assert count == 0
+        movie = get_db().execute("SELECT * FROM movie WHERE movie_id = 1").fetchone()
+        assert movie["deleted"] is not None
+
+        # Check the contribution counter followed the delete
+        movie_count = get_db().execute(
+            "SELECT movie_count FROM user WHERE user_id = 1"
+        ).fetchone()[0]
+        assert movie_count == 0
+
+    # Check the movie is hidden from the views
+    response = client.get("/")
+    assert b"A Test Movie" not in response.data
+
+    response = client.get("/1/update")
+    assert response.status_code == 404
+
+
+def test_deleted_error_not_admin(client, auth):
+    auth.login()
+
+    response = client.get("/deleted")
+    assert response.status_code == 403
+
+    response = client.post("/1/restore")
+    assert response.status_code == 403
+
+
+def test_restore_succeeds(client, auth, app):
+    auth.login('other', 'other')
+    client.post("/1/delete")
+
+    response = client.get("/deleted")
+    assert b"A Test Movie" in response.data
+
+    response = client.post("/1/restore")
+
+    # Check we redirected to the deleted movies page
+    expected_location = "/deleted"
+    actual_location = response.headers["Location"]
+
+    assert expected_location == actual_location
+
+    # Check the movie and its contribution count are back
+    with app.app_context():
+        movie = get_db().execute("SELECT * FROM movie WHERE movie_id = 1").fetchone()
+        assert movie["deleted"] is None
+
+        movie_count = get_db().execute(
+            "SELECT movie_count FROM user WHERE user_id = 1"
+        ).fetchone()[0]
+        assert movie_count == 1
+
+
+def test_restore_error_not_deleted(client, auth):
+    auth.login('other', 'other')
+
+    response = client.post("/1/restore")
+    assert response.status_code == 404
 
 
 def test_validate_movie_request_no_title():
@@ -101,3 +339,14 @@ def test_validate_move_request_no_plot():
 def test_validate_movie_request_succeeds():
     validation_error = _validate_movie_request("A Test Title", "A fake plot")
     assert validation_error is None
+
+def test_validate_movie_requests_matches_single_validation():
+    movies = [
+        (None, "A fake plot"),
+        ("A Test Title", None),
+        (None, None),
+        ("A Test Title", "A fake plot"),
+    ]
+
+    expected_errors = [_validate_movie_request(*movie) for movie in movies]
+    assert validate_movie_requests(movies) == expected_errors